@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from smbus2 import SMBus
@@ -13,6 +14,8 @@ if TYPE_CHECKING:
 # ADS1115 register addresses
 _CONVERSION_REG = 0x00
 _CONFIG_REG = 0x01
+_LO_THRESH_REG = 0x02
+_HI_THRESH_REG = 0x03
 
 # Config register bits
 _OS_SINGLE = 1 << 15  # Start single conversion
@@ -41,91 +44,252 @@ _PGA_VOLTAGE = {
     16: 0.256,
 }
 
-# Mode: single-shot
+# Mode: continuous or single-shot
+_MODE_CONTINUOUS = 0x0000
 _MODE_SINGLE = 0x0100
 
-# Data rate: 128 SPS (default)
-_DR_128SPS = 0x0080
+# Data rate settings (bits 7:5)
+_DR_8SPS = 0x0000
+_DR_16SPS = 0x0020
+_DR_32SPS = 0x0040
+_DR_64SPS = 0x0060
+_DR_128SPS = 0x0080  # Default
+_DR_250SPS = 0x00A0
+_DR_475SPS = 0x00C0
+_DR_860SPS = 0x00E0
+
+# Data rate register value per samples-per-second setting
+_DATA_RATE = {
+    8: _DR_8SPS,
+    16: _DR_16SPS,
+    32: _DR_32SPS,
+    64: _DR_64SPS,
+    128: _DR_128SPS,
+    250: _DR_250SPS,
+    475: _DR_475SPS,
+    860: _DR_860SPS,
+}
+
+# Nominal single-shot conversion time per data rate, in seconds
+_CONVERSION_TIME = {
+    _DR_8SPS: 1 / 8,
+    _DR_16SPS: 1 / 16,
+    _DR_32SPS: 1 / 32,
+    _DR_64SPS: 1 / 64,
+    _DR_128SPS: 1 / 128,
+    _DR_250SPS: 1 / 250,
+    _DR_475SPS: 1 / 475,
+    _DR_860SPS: 1 / 860,
+}
+
+# Polling after the nominal conversion time has elapsed. The internal
+# oscillator is specified to +/-10%, so give up only after 120% of the
+# nominal conversion time plus a fixed margin for bus latency.
+_POLL_INTERVAL = 200e-6
+_TIMEOUT_FACTOR = 1.2
+_TIMEOUT_MARGIN = 10e-3
 
 # Comparator disabled
 _COMP_DISABLE = 0x0003
 
+# Comparator asserts ALERT/RDY after one conversion. With the threshold
+# registers set to the values below, ALERT/RDY pulses on every conversion.
+_COMP_QUE_1 = 0x0000
+_RDY_HI_THRESH = [0x80, 0x00]
+_RDY_LO_THRESH = [0x00, 0x00]
+
 
 class ADS1115:
     """ADS1115 16-bit, 4-channel ADC driver."""
 
-    def __init__(self, bus: SMBus, address: int = 0x48, gain: float = 1):
+    def __init__(
+        self,
+        bus: SMBus,
+        address: int = 0x48,
+        gain: float = 1,
+        data_rate: int = 128,
+    ):
         self.bus = bus
         self.address = address
         if gain not in _PGA:
             raise ValueError(f"Invalid gain {gain}. Must be one of {list(_PGA.keys())}")
         self.gain = gain
         self._full_scale = _PGA_VOLTAGE[gain]
+        self._lsb_v = self._full_scale / 32767
+        self._conversion_due = 0.0
+        self._conversion_deadline = 0.0
+        self.set_data_rate(data_rate)
+
+    def set_data_rate(self, sps: int) -> None:
+        """Set the conversion rate in samples per second (8-860).
+
+        Higher rates shorten every read at the cost of more noise.
+        """
+        if sps not in _DATA_RATE:
+            raise ValueError(
+                f"Invalid data rate {sps}. Must be one of {list(_DATA_RATE.keys())}"
+            )
+        self.data_rate = sps
+        self._data_rate = _DATA_RATE[sps]
+        self._build_config_words()
+
+    def _build_config_words(self) -> None:
+        """Precompute the single-shot config register bytes for every input."""
+        base = (
+            _OS_SINGLE
+            | _PGA[self.gain]
+            | _MODE_SINGLE
+            | self._data_rate
+            | _COMP_DISABLE
+        )
+        self._cfg_single = {
+            ch: list(divmod(base | mux, 256)) for ch, mux in _MUX_SINGLE.items()
+        }
+        self._cfg_diff = {
+            pair: list(divmod(base | mux, 256)) for pair, mux in _MUX_DIFF.items()
+        }
 
     def _write_config(self, config: int) -> None:
         msb = (config >> 8) & 0xFF
         lsb = config & 0xFF
         self.bus.write_i2c_block_data(self.address, _CONFIG_REG, [msb, lsb])
 
-    def _read_config(self) -> int:
-        data = self.bus.read_i2c_block_data(self.address, _CONFIG_REG, 2)
-        return (data[0] << 8) | data[1]
-
     def _read_conversion(self) -> int:
         data = self.bus.read_i2c_block_data(self.address, _CONVERSION_REG, 2)
-        raw = (data[0] << 8) | data[1]
-        # Convert to signed 16-bit
-        if raw >= 0x8000:
-            raw -= 0x10000
-        return raw
+        return int.from_bytes(bytes(data), "big", signed=True)
+
+    def _start_conversion(self, config: list[int]) -> None:
+        """Write a single-shot config word and note when the result is due."""
+        self.bus.write_i2c_block_data(self.address, _CONFIG_REG, config)
+        now = time.monotonic()
+        conversion_time = _CONVERSION_TIME[self._data_rate]
+        self._conversion_due = now + conversion_time * 0.95
+        self._conversion_deadline = (
+            now + conversion_time * _TIMEOUT_FACTOR + _TIMEOUT_MARGIN
+        )
 
     def _wait_conversion(self) -> None:
-        """Poll the OS bit until conversion is complete."""
-        for _ in range(100):
-            if self._read_config() & _OS_NOT_BUSY:
+        """Sleep until the conversion is due, then poll the OS bit.
+
+        Must follow _start_conversion() with no other access to this ADC in
+        between: the register pointer is left at the config register, so a
+        plain byte read returns its MSB.
+        """
+        remaining = self._conversion_due - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        while True:
+            if self.bus.read_byte(self.address) & (_OS_NOT_BUSY >> 8):
                 return
-            time.sleep(0.001)
-        raise TimeoutError("ADS1115 conversion timed out")
+            if time.monotonic() > self._conversion_deadline:
+                raise TimeoutError("ADS1115 conversion timed out")
+            time.sleep(_POLL_INTERVAL)
 
     def read(self, channel: int) -> int:
         """Read a single-ended channel (0-3). Returns signed 16-bit raw value."""
-        if channel not in _MUX_SINGLE:
+        if channel not in self._cfg_single:
             raise ValueError(f"Invalid channel {channel}. Must be 0-3.")
-        config = (
-            _OS_SINGLE
-            | _MUX_SINGLE[channel]
-            | _PGA[self.gain]
-            | _MODE_SINGLE
-            | _DR_128SPS
-            | _COMP_DISABLE
-        )
-        self._write_config(config)
+        self._start_conversion(self._cfg_single[channel])
         self._wait_conversion()
         return self._read_conversion()
 
     def read_differential(self, pos: int, neg: int) -> int:
         """Read a differential pair. Returns signed 16-bit raw value."""
         key = (pos, neg)
-        if key not in _MUX_DIFF:
+        if key not in self._cfg_diff:
             raise ValueError(
                 f"Invalid differential pair ({pos}, {neg}). "
                 f"Must be one of {list(_MUX_DIFF.keys())}."
             )
-        config = (
-            _OS_SINGLE
-            | _MUX_DIFF[key]
+        self._start_conversion(self._cfg_diff[key])
+        self._wait_conversion()
+        return self._read_conversion()
+
+    def start_conversion(self, channel: int) -> None:
+        """Start a single-shot conversion on a channel (0-3) without waiting.
+
+        Other I2C devices can be used while the conversion runs. Collect the
+        result with fetch_result() before accessing this ADC again.
+        """
+        if channel not in self._cfg_single:
+            raise ValueError(f"Invalid channel {channel}. Must be 0-3.")
+        self._start_conversion(self._cfg_single[channel])
+
+    def fetch_result(self) -> int:
+        """Wait for the conversion started by start_conversion() and read it."""
+        self._wait_conversion()
+        return self._read_conversion()
+
+    def start_continuous(self, channel: int) -> None:
+        """Start continuous conversions on a single-ended channel (0-3).
+
+        ALERT/RDY is configured to pulse on every completed conversion.
+        The first result is available after one conversion period.
+        """
+        if channel not in _MUX_SINGLE:
+            raise ValueError(f"Invalid channel {channel}. Must be 0-3.")
+        self.bus.write_i2c_block_data(self.address, _HI_THRESH_REG, _RDY_HI_THRESH)
+        self.bus.write_i2c_block_data(self.address, _LO_THRESH_REG, _RDY_LO_THRESH)
+        self._write_config(
+            _MUX_SINGLE[channel]
+            | _PGA[self.gain]
+            | _MODE_CONTINUOUS
+            | self._data_rate
+            | _COMP_QUE_1
+        )
+
+    def read_continuous(self) -> int:
+        """Read the latest continuous-mode result. Returns signed 16-bit raw value."""
+        return self._read_conversion()
+
+    def stop_continuous(self) -> None:
+        """Return to single-shot mode. The device powers down until the next read."""
+        self._write_config(
+            _MUX_SINGLE[0]
             | _PGA[self.gain]
             | _MODE_SINGLE
-            | _DR_128SPS
+            | self._data_rate
             | _COMP_DISABLE
         )
-        self._write_config(config)
-        self._wait_conversion()
-        return self._read_conversion()
+
+    def read_burst(self, channel: int, count: int) -> list[int]:
+        """Read count consecutive samples of a channel in continuous mode.
+
+        Uses one config write for the whole burst instead of one per sample.
+        The ADC is returned to single-shot mode afterwards.
+        """
+        # Wait slightly longer than one period so that an oscillator running
+        # up to 10% slow still produces a fresh sample for every read.
+        period = _CONVERSION_TIME[self._data_rate] * 1.1
+        self.start_continuous(channel)
+        try:
+            samples = []
+            for _ in range(count):
+                time.sleep(period)
+                samples.append(self.read_continuous())
+            return samples
+        finally:
+            self.stop_continuous()
+
+    def read_all(self, channels: Iterable[int] = range(4)) -> list[int]:
+        """Read several single-ended channels (default all four) in order.
+
+        Returns raw values; use raws_to_v() to convert them in one pass.
+        """
+        channels = list(channels)
+        for channel in channels:
+            if channel not in self._cfg_single:
+                raise ValueError(f"Invalid channel {channel}. Must be 0-3.")
+        return [self.read(channel) for channel in channels]
 
     def raw_to_v(self, raw: int) -> float:
         """Convert a raw ADC reading to voltage."""
-        return raw * self._full_scale / 32767
+        return raw * self._lsb_v
+
+    def raws_to_v(self, raws: Iterable[int]) -> list[float]:
+        """Convert a sequence of raw ADC readings to voltages."""
+        lsb_v = self._lsb_v
+        return [raw * lsb_v for raw in raws]
 
 
 class ADCChannel:
@@ -139,15 +303,33 @@ class ADCChannel:
     ):
         self.adc = adc
         self.channel = channel
-        self.scale = scale
         if rt is not None:
-            self.scale = self.scale * (rt + self.rb) / self.rb
+            scale = scale * (rt + self.rb) / self.rb
+        self.scale = scale
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: float) -> None:
+        self._scale = value
+        self._v_per_count = value * self.adc._lsb_v
 
     def read_raw(self) -> int:
         return self.adc.read(self.channel)
 
     def read_v(self) -> float:
-        return self.scale * self.adc.raw_to_v(self.read_raw())
+        return self._v_per_count * self.adc.read(self.channel)
+
+    def read_raw_v(self) -> tuple[int, float]:
+        """Return (raw, volts) from a single conversion."""
+        raw = self.adc.read(self.channel)
+        return raw, self._v_per_count * raw
+
+    def read_burst(self, count: int) -> list[int]:
+        """Read count consecutive raw samples using continuous mode."""
+        return self.adc.read_burst(self.channel, count)
 
 
 class ADCDiff:
@@ -161,11 +343,25 @@ class ADCDiff:
         self.neg_channel = neg_channel
         self.scale = scale
 
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: float) -> None:
+        self._scale = value
+        self._v_per_count = value * self.adc._lsb_v
+
     def read_raw(self) -> int:
         return self.adc.read_differential(self.pos_channel, self.neg_channel)
 
     def read_v(self) -> float:
-        return self.scale * self.adc.raw_to_v(self.read_raw())
+        return self._v_per_count * self.read_raw()
+
+    def read_raw_v(self) -> tuple[int, float]:
+        """Return (raw, volts) from a single conversion."""
+        raw = self.read_raw()
+        return raw, self._v_per_count * raw
 
 
 class AnalogMuxADCChannel:
@@ -190,3 +386,8 @@ class AnalogMuxADCChannel:
     def read_v(self) -> float:
         self.anamux.select(self.mux_num, self.mux_pin)
         return self.adc_channel.read_v()
+
+    def read_raw_v(self) -> tuple[int, float]:
+        """Return (raw, volts) from a single conversion."""
+        self.anamux.select(self.mux_num, self.mux_pin)
+        return self.adc_channel.read_raw_v()
@@ -8,9 +8,28 @@ ANAMUX_CONFIG = 0x0000  # All pins are outputs
 ANAMUX_INITIAL_STATE = 0x8811
 ANAMUX_CTRL_ADDR = 0x21
 
-INH_PINS = [0o17, 0o13, 0o00, 0o04]
-ADDR_PINS = [0o14, 0o10, 0o01, 0o05]
-ADDR_REVERSED = [True, True, False, False]
+INH_PINS = (0o17, 0o13, 0o00, 0o04)
+ADDR_PINS = (0o14, 0o10, 0o01, 0o05)
+ADDR_REVERSED = (True, True, False, False)
+
+# 3-bit reversal lookup: _REV3[n] is n with bits 2..0 reversed
+_REV3 = (0, 4, 2, 6, 1, 5, 3, 7)
+
+# Per-mux (inh_pin, addr_pin, addr_reversed), indexed by mux_num - 1
+_MUX_TABLE = tuple(zip(INH_PINS, ADDR_PINS, ADDR_REVERSED))
+
+
+def _compute_enable(value: int, mux_num: int, state: bool) -> int:
+    """Return value with the INH pin of mux_num set for the given state."""
+    inh_bit = 1 << _MUX_TABLE[mux_num - 1][0]
+    return value & ~inh_bit if state else value | inh_bit
+
+
+def _compute_set(value: int, mux_num: int, active_pin: int) -> int:
+    """Return value with the address pins of mux_num set to active_pin."""
+    _, addr_pin, reversed_ = _MUX_TABLE[mux_num - 1]
+    addr = _REV3[active_pin] if reversed_ else active_pin
+    return (value & ~(0b111 << addr_pin)) | (addr << addr_pin)
 
 
 class AnalogMux:
@@ -29,21 +48,7 @@ class AnalogMux:
         if not 1 <= mux_num <= 4:
             raise ValueError(f"mux_num must be 1-4, got {mux_num}")
 
-        current = self.ctrl.output
-        inh = not state
-        inh_pin = INH_PINS[mux_num - 1]
-        inh_mask = 0xFFFF & ~(1 << inh_pin)
-        current = (current & inh_mask) | (inh << inh_pin)
-
-        self.ctrl.write(current)
-
-    @staticmethod
-    def _reverse_bits(value: int, num_bits: int) -> int:
-        reversed_value = 0
-        for i in range(num_bits):
-            if value & (1 << i):
-                reversed_value |= 1 << (num_bits - 1 - i)
-        return reversed_value
+        self.ctrl.write(_compute_enable(self.ctrl.output, mux_num, state))
 
     def set(self, mux_num: int, active_pin: int) -> None:
         """Set the active pin (0-7) for a multiplexer (1-4)."""
@@ -52,20 +57,31 @@ class AnalogMux:
         if not 0 <= active_pin <= 7:
             raise ValueError(f"active_pin must be 0-7, got {active_pin}")
 
+        self.ctrl.write(_compute_set(self.ctrl.output, mux_num, active_pin))
+
+    def select(self, mux_num: int, active_pin: int) -> None:
+        """Select the active pin and enable the mux (break-before-make).
+
+        The mux is inhibited and the new address written in one write; INH
+        is released only in a second write, once the address has settled.
+        Writes that would not change the outputs are skipped.
+        """
+        if not 1 <= mux_num <= 4:
+            raise ValueError(f"mux_num must be 1-4, got {mux_num}")
+        if not 0 <= active_pin <= 7:
+            raise ValueError(f"active_pin must be 0-7, got {active_pin}")
+
         current = self.ctrl.output
-        addr_pin = ADDR_PINS[mux_num - 1]
-        addr_mask = 0xFFFF & ~(0b111 << addr_pin)
-        addr = (
-            self._reverse_bits(active_pin, 3)
-            if ADDR_REVERSED[mux_num - 1]
-            else active_pin
+        addressed = _compute_set(
+            _compute_enable(current, mux_num, False), mux_num, active_pin
         )
-        current = (current & addr_mask) | (addr << addr_pin)
+        target = _compute_enable(addressed, mux_num, True)
+        if target == current:
+            return
 
-        self.ctrl.write(current)
-
-    def select(self, mux_num: int, active_pin: int) -> None:
-        """Disable mux, set address, then re-enable (break-before-make)."""
-        self.enable(mux_num, False)
-        self.set(mux_num, active_pin)
-        self.enable(mux_num, True)
+        if addressed != current:
+            self.ctrl.write(addressed)
+            # Inside a batch, send the inhibit step now to keep
+            # break-before-make; the enable is committed with the batch.
+            self.ctrl.commit()
+        self.ctrl.write(target)
@@ -1,17 +1,31 @@
 """HalspaBoard: top-level object that owns the I2C bus and all HALSPA devices."""
 
-from smbus2 import SMBus
+from collections.abc import Iterable
+from functools import cached_property
+
+from smbus2 import I2cFunc, SMBus
 
 from halspa.adc import ADS1115
 from halspa.analog_mux import AnalogMux
 from halspa.power import PowerControl
 from halspa.tca9535 import TCA9535
 
+# I2C addresses of the on-board devices: power, mux, digexp1/2, adc1/2
+BOARD_ADDRESSES = (0x20, 0x21, 0x22, 0x23, 0x48, 0x49)
+
+# Ranges where a quick write can corrupt some EEPROMs; probe with a byte read
+# instead, as i2cdetect does.
+_READ_PROBE_ADDRESSES = frozenset(range(0x30, 0x38)) | frozenset(range(0x50, 0x60))
+
 
 class HalspaBoard:
     """HALSPA test jig interface board.
 
-    Opens an SMBus and creates all on-board device drivers.
+    Opens an SMBus and provides all on-board device drivers. Power control
+    and the digital expanders are initialized immediately, switching all DUT
+    rails off and all expander pins to inputs so nothing left over from a
+    previous process drives the DUT. The analog mux and the ADCs are created,
+    and their devices initialized, on first access.
     Use as a context manager or call close() when done.
     """
 
@@ -19,25 +33,53 @@ class HalspaBoard:
         self.bus = SMBus(i2c_bus)
         try:
             self.power = PowerControl(self.bus)
-            self.mux = AnalogMux(self.bus)
             self.digexp1 = TCA9535(self.bus, address=0x22)
             self.digexp2 = TCA9535(self.bus, address=0x23)
-            self.adc1 = ADS1115(self.bus, address=0x48, gain=1)
-            self.adc2 = ADS1115(self.bus, address=0x49, gain=1)
         except Exception:
             self.bus.close()
             raise
 
-    def i2c_scan(self) -> list[int]:
-        """Probe all 7-bit I2C addresses and return those that ACK."""
-        found = []
-        for addr in range(0x03, 0x78):
-            try:
+    @cached_property
+    def mux(self) -> AnalogMux:
+        return AnalogMux(self.bus)
+
+    @cached_property
+    def adc1(self) -> ADS1115:
+        return ADS1115(self.bus, address=0x48, gain=1)
+
+    @cached_property
+    def adc2(self) -> ADS1115:
+        return ADS1115(self.bus, address=0x49, gain=1)
+
+    def _probe(self, addr: int, quick: bool) -> bool:
+        try:
+            if quick and addr not in _READ_PROBE_ADDRESSES:
+                self.bus.write_quick(addr)
+            else:
                 self.bus.read_byte(addr)
-                found.append(addr)
-            except OSError:
-                pass
-        return found
+        except OSError:
+            return False
+        return True
+
+    def i2c_scan(
+        self, only: Iterable[int] | None = None, skip: Iterable[int] = ()
+    ) -> list[int]:
+        """Probe 7-bit I2C addresses and return those that ACK, sorted.
+
+        By default every non-reserved address (0x03-0x77) is probed. Pass
+        only= to restrict the scan to known addresses (only=BOARD_ADDRESSES
+        checks just the on-board devices), and skip= to leave out addresses
+        that must not be touched.
+        """
+        candidates = range(0x03, 0x78) if only is None else sorted(set(only))
+        skipped = frozenset(skip)
+        # Adapters without SMBus quick support are probed with byte reads
+        quick = bool(self.bus.funcs & I2cFunc.SMBUS_QUICK)
+        return [
+            addr
+            for addr in candidates
+            if addr not in skipped and self._probe(addr, quick)
+        ]
 
     def close(self) -> None:
         """Close the I2C bus."""
@@ -6,8 +6,14 @@ Each enable/disable method can be used in two ways:
 2. As a context manager: Call with no argument to enable on entry, disable on exit.
 
 The 'defer' argument batches changes without writing to hardware until commit().
+Inside a 'with power.batch():' block all changes are deferred and written at once
+when the block exits. enable_many() sets several outputs in one call.
+
+Fault and power-good status can be cached for 'cache_ttl' seconds so that polling
+both costs a single input register read.
 """
 
+import time
 from contextlib import AbstractContextManager, contextmanager
 
 from smbus2 import SMBus
@@ -36,46 +42,82 @@ FAULT_12V_2_PIN = 0o11
 PG_3V3_PIN = 0o14
 PG_5VD_PIN = 0o17
 
+_OUTPUT_MASK = (
+    (1 << EN_LIM_1_PIN)
+    | (1 << EN_LIM_2_PIN)
+    | (1 << EN_LIM_3_PIN)
+    | (1 << EN_LIM_4_PIN)
+    | (1 << EN_12V_1_PIN)
+    | (1 << EN_12V_2_PIN)
+    | (1 << EN_3V3D_PIN)
+    | (1 << EN_5VD_PIN)
+)
+
+_FAULT_MASK = (
+    (1 << FAULT_LIM_1_PIN)
+    | (1 << FAULT_LIM_2_PIN)
+    | (1 << FAULT_LIM_3_PIN)
+    | (1 << FAULT_LIM_4_PIN)
+    | (1 << FAULT_12V_1_PIN)
+    | (1 << FAULT_12V_2_PIN)
+)
+
+# Fault flags are active-low on the pins; invert them in the TCA9535
+_ACT_LOW_MASK = _FAULT_MASK
+
+_PG_MASK = (1 << PG_3V3_PIN) | (1 << PG_5VD_PIN)
+
+_RAIL_PINS = {
+    "5v": EN_5VD_PIN,
+    "3v3": EN_3V3D_PIN,
+    "12v_1": EN_12V_1_PIN,
+    "12v_2": EN_12V_2_PIN,
+    "current_limit_1": EN_LIM_1_PIN,
+    "current_limit_2": EN_LIM_2_PIN,
+    "current_limit_3": EN_LIM_3_PIN,
+    "current_limit_4": EN_LIM_4_PIN,
+}
+
+_FAULT_BITS = (
+    ("current_limit_1", FAULT_LIM_1_PIN),
+    ("current_limit_2", FAULT_LIM_2_PIN),
+    ("current_limit_3", FAULT_LIM_3_PIN),
+    ("current_limit_4", FAULT_LIM_4_PIN),
+    ("12v_1", FAULT_12V_1_PIN),
+    ("12v_2", FAULT_12V_2_PIN),
+)
+
+
+def decode_fault(word: int) -> dict[str, bool]:
+    """Decode a fault bitmask (as from read_fault()) into per-output flags."""
+    return {name: bool((word >> pin) & 1) for name, pin in _FAULT_BITS}
+
 
 class PowerControl:
     """Controls DUT power rails and current limiters via TCA9535 at 0x20."""
 
-    def __init__(self, bus: SMBus):
-        output_mask = 0xFFFF ^ (
-            (1 << EN_LIM_1_PIN)
-            | (1 << EN_LIM_2_PIN)
-            | (1 << EN_LIM_3_PIN)
-            | (1 << EN_LIM_4_PIN)
-            | (1 << EN_12V_1_PIN)
-            | (1 << EN_12V_2_PIN)
-            | (1 << EN_3V3D_PIN)
-            | (1 << EN_5VD_PIN)
-        )
-
-        act_low_mask = (
-            (1 << FAULT_LIM_1_PIN)
-            | (1 << FAULT_LIM_2_PIN)
-            | (1 << FAULT_LIM_3_PIN)
-            | (1 << FAULT_LIM_4_PIN)
-            | (1 << FAULT_12V_1_PIN)
-            | (1 << FAULT_12V_2_PIN)
-        )
-
+    def __init__(self, bus: SMBus, cache_ttl: float = 0.0):
         self.tca9535 = TCA9535(
             bus,
             address=0x20,
-            configuration=output_mask,
-            polarity_inversion=act_low_mask,
+            configuration=0xFFFF ^ _OUTPUT_MASK,
+            polarity_inversion=_ACT_LOW_MASK,
             output=0,
         )
+        self.cache_ttl = cache_ttl
+        self._status_cache: tuple[int, float] | None = None
+
+    def _write_bit(self, pin: int, state: bool, defer: bool = False) -> None:
+        self.tca9535.write_bit(pin, state, defer)
+        self.invalidate_status()
 
     @contextmanager
     def _power_context(self, pin: int, defer: bool = False):
         try:
-            self.tca9535.write_bit(pin, True, defer)
+            self._write_bit(pin, True, defer)
             yield
         finally:
-            self.tca9535.write_bit(pin, False)
+            self._write_bit(pin, False)
 
     def _maybe_context(
         self, pin: int, state: bool | None = None, defer: bool = False
@@ -83,9 +125,18 @@ class PowerControl:
         if state is None:
             return self._power_context(pin, defer)
         else:
-            self.tca9535.write_bit(pin, state, defer)
+            self._write_bit(pin, state, defer)
             return None
 
+    @contextmanager
+    def batch(self):
+        """Defer all changes made in the block and commit them once on exit."""
+        try:
+            with self.tca9535.batch():
+                yield
+        finally:
+            self.invalidate_status()
+
     def enable_5v(
         self, state: bool | None = None, defer: bool = False
     ) -> AbstractContextManager[None] | None:
@@ -126,27 +177,49 @@ class PowerControl:
     ) -> AbstractContextManager[None] | None:
         return self._maybe_context(EN_LIM_4_PIN, state, defer)
 
+    def enable_many(self, states: dict[str, bool], defer: bool = False) -> None:
+        """Set several outputs at once, e.g. {"5v": True, "current_limit_1": False}.
+
+        Output names match the enable_* methods. All changes go out in a single
+        register write.
+        """
+        updates = []
+        for name, state in states.items():
+            if name not in _RAIL_PINS:
+                raise ValueError(f"Unknown power output {name!r}")
+            updates.append((_RAIL_PINS[name], state))
+        self.tca9535.write_bits(updates, defer)
+        self.invalidate_status()
+
     def commit(self) -> None:
         """Write all deferred changes to hardware."""
         self.tca9535.commit()
+        self.invalidate_status()
 
     def disable_all(self) -> None:
         """Disable all power rails and current limiters."""
-        self.tca9535.write(0)
+        self.tca9535.write(0, force=True)
+        self.invalidate_status()
+
+    def read_status(self, max_age_s: float = 0.0) -> int:
+        """Read the input register, reusing a cached value younger than max_age_s."""
+        now = time.monotonic()
+        if self._status_cache is not None:
+            value, timestamp = self._status_cache
+            if now - timestamp < max_age_s:
+                return value
+        value = self.tca9535.read()
+        self._status_cache = (value, now)
+        return value
+
+    def invalidate_status(self) -> None:
+        """Drop the cached status so the next read goes to hardware."""
+        self._status_cache = None
 
     def read_fault(self) -> int:
         """Read fault status bits. Returns bitmask of active faults."""
-        fault_mask = (
-            (1 << FAULT_LIM_1_PIN)
-            | (1 << FAULT_LIM_2_PIN)
-            | (1 << FAULT_LIM_3_PIN)
-            | (1 << FAULT_LIM_4_PIN)
-            | (1 << FAULT_12V_1_PIN)
-            | (1 << FAULT_12V_2_PIN)
-        )
-        return self.tca9535.read() & fault_mask
+        return self.read_status(self.cache_ttl) & _FAULT_MASK
 
     def read_power_good(self) -> int:
         """Read power-good status bits."""
-        pg_mask = (1 << PG_3V3_PIN) | (1 << PG_5VD_PIN)
-        return self.tca9535.read() & pg_mask
+        return self.read_status(self.cache_ttl) & _PG_MASK
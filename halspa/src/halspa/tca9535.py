@@ -1,5 +1,8 @@
 """TCA9535 I2C 16-bit GPIO expander driver over smbus2."""
 
+from collections.abc import Iterable
+from contextlib import contextmanager
+
 from smbus2 import SMBus
 
 INPUT_PORT_0 = 0x00
@@ -12,10 +15,16 @@ CONFIGURATION_PORT_0 = 0x06
 CONFIGURATION_PORT_1 = 0x07
 
 
+def _port_bits(mask: int) -> int:
+    """Return which ports mask covers (bit 0 = port 0, bit 1 = port 1)."""
+    return (1 if mask & 0x00FF else 0) | (2 if mask & 0xFF00 else 0)
+
+
 class TCA9535Pin:
     def __init__(self, tca9535: "TCA9535", pin: int):
         self.tca9535 = tca9535
         self.pin = pin
+        self._mask = 1 << pin
 
     def read(self) -> bool:
         """Read the input state of this pin."""
@@ -27,21 +36,21 @@ class TCA9535Pin:
 
     def toggle(self) -> None:
         """Toggle the output state of this pin (uses shadow output register)."""
-        current = bool(self.tca9535.output & (1 << self.pin))
-        self.tca9535.write_bit(self.pin, not current)
+        self.tca9535.toggle_mask(self._mask)
 
     @property
     def is_output(self) -> bool:
         """Return True if the pin is configured as output."""
-        return not bool(self.tca9535.configuration & (1 << self.pin))
+        return not self.tca9535.configuration & self._mask
 
     def configure(self, output: bool) -> None:
         """Configure pin direction. output=True for output, False for input."""
+        configuration = self.tca9535.configuration
         if output:
-            self.tca9535.configuration &= ~(1 << self.pin)
+            configuration &= ~self._mask
         else:
-            self.tca9535.configuration |= 1 << self.pin
-        self.tca9535.write_configuration(self.tca9535.configuration)
+            configuration |= self._mask
+        self.tca9535.write_configuration(configuration)
 
 
 class TCA9535:
@@ -63,42 +72,101 @@ class TCA9535:
         self.output = output
         self.polarity_inversion = polarity_inversion
         self.configuration = configuration
+        # Output ports changed by deferred writes (bit 0 = port 0, bit 1 = port 1)
+        self._dirty = 0
+        self._batching = False
 
         # Initialize the device
-        self.write(self.output)
+        self.write(self.output, force=True)
         self.write_polarity_inversion(self.polarity_inversion)
         self.write_configuration(self.configuration)
 
+    def _write_pair(self, register: int, value: int) -> None:
+        # The device toggles between the two registers of a pair, so both
+        # ports go out in a single transaction.
+        self.bus.write_i2c_block_data(
+            self.address, register, [value & 0xFF, (value >> 8) & 0xFF]
+        )
+
+    def _write_port(self, port: int) -> None:
+        self.bus.write_byte_data(
+            self.address, OUTPUT_PORT_0 + port, (self.output >> (8 * port)) & 0xFF
+        )
+        self._dirty &= ~(1 << port)
+
+    def _update_ports(self, previous: int, touched: int, defer: bool) -> None:
+        # Mark the output ports whose value changed as dirty, then write the
+        # touched ports that are dirty. A port stays dirty until its write
+        # succeeds, so a retry after a bus error is not skipped.
+        self._dirty |= _port_bits(previous ^ self.output)
+        if defer or self._batching:
+            return
+        ports = _port_bits(touched) & self._dirty
+        if ports == 0b11:
+            self.write(self.output, force=True)
+        elif ports:
+            self._write_port(ports >> 1)
+
     def read(self) -> int:
         """Read both input ports. Returns combined 16-bit value."""
-        input0 = self.bus.read_byte_data(self.address, INPUT_PORT_0)
-        input1 = self.bus.read_byte_data(self.address, INPUT_PORT_1)
-        self.input = input0 | (input1 << 8)
+        data = self.bus.read_i2c_block_data(self.address, INPUT_PORT_0, 2)
+        self.input = data[0] | (data[1] << 8)
         return self.input
 
-    def write(self, value: int) -> None:
-        """Write a 16-bit value to both output ports."""
-        self.bus.write_byte_data(self.address, OUTPUT_PORT_0, value & 0xFF)
-        self.bus.write_byte_data(self.address, OUTPUT_PORT_1, (value >> 8) & 0xFF)
+    def write(self, value: int, force: bool = False) -> None:
+        """Write a 16-bit value to both output ports.
+
+        The write is skipped if the hardware already holds value, unless
+        force=True. Inside batch() the value is only stored and committed
+        with the other changes on exit.
+        """
+        if self._batching:
+            self._dirty |= 0b11 if force else _port_bits(value ^ self.output)
+            self.output = value
+            return
+        if value == self.output and not self._dirty and not force:
+            return
+        self._write_pair(OUTPUT_PORT_0, value)
         self.output = value
+        self._dirty = 0
 
     def write_bit(self, pin: int, value: bool, defer: bool = False) -> None:
         """Set a single output pin. If defer=True, don't write to hardware."""
         if not 0 <= pin <= 15:
             raise ValueError(f"Pin must be 0-15, got {pin}")
+        previous = self.output
         if value:
             self.output |= 1 << pin
         else:
             self.output &= ~(1 << pin)
-        if not defer:
-            if pin < 8:
-                self.bus.write_byte_data(
-                    self.address, OUTPUT_PORT_0, self.output & 0xFF
-                )
+        self._update_ports(previous, 1 << pin, defer)
+
+    def write_bits(
+        self, updates: Iterable[tuple[int, bool]], defer: bool = False
+    ) -> None:
+        """Set several output pins at once in a single bus transaction."""
+        set_mask = 0
+        clear_mask = 0
+        for pin, value in updates:
+            if not 0 <= pin <= 15:
+                raise ValueError(f"Pin must be 0-15, got {pin}")
+            if value:
+                set_mask |= 1 << pin
+                clear_mask &= ~(1 << pin)
             else:
-                self.bus.write_byte_data(
-                    self.address, OUTPUT_PORT_1, (self.output >> 8) & 0xFF
-                )
+                clear_mask |= 1 << pin
+                set_mask &= ~(1 << pin)
+        previous = self.output
+        self.output = (previous & ~clear_mask) | set_mask
+        self._update_ports(previous, set_mask | clear_mask, defer)
+
+    def toggle_mask(self, mask: int, defer: bool = False) -> None:
+        """Invert the output pins set in mask (uses shadow output register)."""
+        if not 0 <= mask <= 0xFFFF:
+            raise ValueError(f"Mask must be 0x0000-0xFFFF, got {mask:#x}")
+        previous = self.output
+        self.output ^= mask
+        self._update_ports(previous, mask, defer)
 
     def read_bit(self, pin: int) -> bool:
         """Read the input state of a single pin."""
@@ -107,28 +175,42 @@ class TCA9535:
         self.read()
         return bool(self.input & (1 << pin))
 
+    def read_bits(self, mask: int) -> int:
+        """Read the input pins set in mask with one bus transaction."""
+        if not 0 <= mask <= 0xFFFF:
+            raise ValueError(f"Mask must be 0x0000-0xFFFF, got {mask:#x}")
+        return self.read() & mask
+
     def commit(self) -> None:
-        """Write the current shadow output register to hardware."""
-        self.write(self.output)
+        """Write the output ports changed by deferred writes to hardware."""
+        if self._dirty == 0b11:
+            # Write the pair directly: write() only re-marks it while batching
+            self._write_pair(OUTPUT_PORT_0, self.output)
+            self._dirty = 0
+        elif self._dirty:
+            self._write_port(self._dirty >> 1)
+
+    @contextmanager
+    def batch(self):
+        """Defer all output writes made in the block and commit them once on exit."""
+        if self._batching:
+            yield
+            return
+        self._batching = True
+        try:
+            yield
+        finally:
+            self._batching = False
+            self.commit()
 
     def write_configuration(self, value: int) -> None:
         """Write the 16-bit configuration register (1=input, 0=output)."""
-        self.bus.write_byte_data(
-            self.address, CONFIGURATION_PORT_0, value & 0xFF
-        )
-        self.bus.write_byte_data(
-            self.address, CONFIGURATION_PORT_1, (value >> 8) & 0xFF
-        )
+        self._write_pair(CONFIGURATION_PORT_0, value)
         self.configuration = value
 
     def write_polarity_inversion(self, value: int) -> None:
         """Write the 16-bit polarity inversion register."""
-        self.bus.write_byte_data(
-            self.address, POLARITY_INVERSION_PORT_0, value & 0xFF
-        )
-        self.bus.write_byte_data(
-            self.address, POLARITY_INVERSION_PORT_1, (value >> 8) & 0xFF
-        )
+        self._write_pair(POLARITY_INVERSION_PORT_0, value)
         self.polarity_inversion = value
 
     def get_pin(self, pin: int) -> TCA9535Pin:
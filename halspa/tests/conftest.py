@@ -0,0 +1,15 @@
+"""Shared fixtures for the mocked-SMBus unit tests."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def bus():
+    mock = MagicMock()
+    # Input/conversion block reads return zero by default
+    mock.read_i2c_block_data.return_value = [0, 0]
+    # ADS1115 config MSB poll returns OS bit set (not busy)
+    mock.read_byte.return_value = 0x80
+    return mock
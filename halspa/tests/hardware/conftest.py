@@ -6,9 +6,9 @@ When no hardware is present, all tests skip automatically.
 
 import pytest
 
-from halspa.board import HalspaBoard
+from halspa.board import BOARD_ADDRESSES, HalspaBoard
 
-EXPECTED_ADDRESSES = {0x20, 0x21, 0x22, 0x23, 0x48, 0x49}
+EXPECTED_ADDRESSES = set(BOARD_ADDRESSES)
 
 
 @pytest.fixture(scope="session")
@@ -21,3 +21,9 @@ def board():
     yield b
     b.power.disable_all()
     b.close()
+
+
+@pytest.fixture(scope="session")
+def i2c_addresses(board):
+    """Addresses found by a single bus scan, shared by the whole session."""
+    return set(board.i2c_scan())
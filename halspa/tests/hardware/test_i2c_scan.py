@@ -3,16 +3,14 @@
 from .conftest import EXPECTED_ADDRESSES
 
 
-def test_all_devices_respond(board):
-    found = set(board.i2c_scan())
-    missing = EXPECTED_ADDRESSES - found
+def test_all_devices_respond(i2c_addresses):
+    missing = EXPECTED_ADDRESSES - i2c_addresses
     assert not missing, f"Missing I2C devices: {[hex(a) for a in sorted(missing)]}"
 
 
-def test_no_unexpected_devices(board):
+def test_no_unexpected_devices(i2c_addresses):
     """Flag unexpected addresses (informational, not a hard failure)."""
-    found = set(board.i2c_scan())
-    unexpected = found - EXPECTED_ADDRESSES
+    unexpected = i2c_addresses - EXPECTED_ADDRESSES
     # Not asserting — unexpected devices may be on the bus legitimately.
     # But we print them so they're visible in test output.
     if unexpected:
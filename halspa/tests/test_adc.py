@@ -1,18 +1,39 @@
 """Tests for ADS1115 driver with mocked SMBus."""
 
-from unittest.mock import MagicMock, call
+from contextlib import contextmanager
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
 from halspa.adc import ADS1115, ADCChannel, ADCDiff, AnalogMuxADCChannel
 
 
-@pytest.fixture
-def bus():
-    mock = MagicMock()
-    # Default: config read returns OS bit set (not busy)
-    mock.read_i2c_block_data.return_value = [0x80, 0x00]
-    return mock
+def program_conversion(bus, *raws):
+    """Queue signed conversion results to be returned by the mocked bus."""
+    data = [list(raw.to_bytes(2, "big", signed=True)) for raw in raws]
+    if len(data) == 1:
+        bus.read_i2c_block_data.return_value = data[0]
+    else:
+        bus.read_i2c_block_data.side_effect = data
+
+
+@contextmanager
+def simulated_clock(bus, ready_at):
+    """Patch time so sleeps advance a fake clock; the ADC is ready at ready_at."""
+    clock = [0.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    def read_byte(addr):
+        return 0x80 if ready_at is not None and clock[0] >= ready_at else 0x00
+
+    bus.read_byte.side_effect = read_byte
+    with (
+        patch("halspa.adc.time.monotonic", lambda: clock[0]),
+        patch("halspa.adc.time.sleep", sleep),
+    ):
+        yield clock
 
 
 @pytest.fixture
@@ -25,16 +46,33 @@ class TestADS1115:
         with pytest.raises(ValueError, match="Invalid gain"):
             ADS1115(bus, gain=3)
 
+    def test_invalid_data_rate_raises(self, bus):
+        with pytest.raises(ValueError, match="Invalid data rate"):
+            ADS1115(bus, data_rate=100)
+
+    def test_data_rate_in_config_word(self, bus):
+        adc = ADS1115(bus, address=0x48, gain=1, data_rate=860)
+        adc.read(0)
+        # DR=111
+        bus.write_i2c_block_data.assert_called_once_with(0x48, 0x01, [0xC3, 0xE3])
+
+    def test_set_data_rate_shortens_wait(self, adc, bus):
+        adc.set_data_rate(860)
+        assert adc.data_rate == 860
+        with patch("halspa.adc.time.sleep") as sleep:
+            adc.read(0)
+        assert sleep.call_args[0][0] < 1 / 860
+
     def test_read_single_channel_0(self, adc, bus):
-        # First read_i2c_block_data call: config read (OS bit set = ready)
-        # Second read_i2c_block_data call: conversion result
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],  # Config: OS=1 (ready)
-            [0x40, 0x00],  # Conversion: 0x4000 = 16384
-        ]
+        # Config poll returns OS bit set (ready), then conversion is read
+        program_conversion(bus, 0x4000)  # 16384
         raw = adc.read(0)
         assert raw == 0x4000
 
+        # Poll reads the config MSB at the current pointer, one block read
+        bus.read_byte.assert_called_with(0x48)
+        bus.read_i2c_block_data.assert_called_once_with(0x48, 0x00, 2)
+
         # Check config was written with correct mux for channel 0 (0x4000)
         write_call = bus.write_i2c_block_data.call_args
         assert write_call[0][1] == 0x01  # Config register
@@ -43,10 +81,7 @@ class TestADS1115:
         assert config_msb & 0x70 == 0x40
 
     def test_read_single_channel_3(self, adc, bus):
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x20, 0x00],
-        ]
+        program_conversion(bus, 0x2000)
         raw = adc.read(3)
         assert raw == 0x2000
 
@@ -54,23 +89,23 @@ class TestADS1115:
         # Channel 3 single-ended: MUX = 111 (bits 14:12)
         assert config_msb & 0x70 == 0x70
 
+    def test_read_writes_full_config_word(self, adc, bus):
+        program_conversion(bus, 0x0000)
+        adc.read(0)
+        # OS=1, MUX=100, PGA=001, MODE=1, DR=100, COMP_QUE=11
+        bus.write_i2c_block_data.assert_called_once_with(0x48, 0x01, [0xC3, 0x83])
+
     def test_read_invalid_channel_raises(self, adc):
         with pytest.raises(ValueError, match="Invalid channel"):
             adc.read(4)
 
     def test_read_negative_value(self, adc, bus):
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0xFF, 0xFE],  # -2 in two's complement
-        ]
+        program_conversion(bus, -2)
         raw = adc.read(0)
         assert raw == -2
 
     def test_read_differential(self, adc, bus):
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x10, 0x00],
-        ]
+        program_conversion(bus, 0x1000)
         raw = adc.read_differential(0, 1)
         assert raw == 0x1000
 
@@ -82,6 +117,49 @@ class TestADS1115:
         with pytest.raises(ValueError, match="Invalid differential pair"):
             adc.read_differential(1, 2)
 
+    def test_read_all(self, adc, bus):
+        program_conversion(bus, 0x0001, 0x0002, 0x0003, -1)
+        assert adc.read_all() == [1, 2, 3, -1]
+
+        mux_bits = [c[0][2][0] & 0x70 for c in bus.write_i2c_block_data.call_args_list]
+        assert mux_bits == [0x40, 0x50, 0x60, 0x70]
+
+    def test_read_all_subset(self, adc, bus):
+        program_conversion(bus, 0x0010, 0x0020)
+        assert adc.read_all([3, 1]) == [0x10, 0x20]
+        mux_bits = [c[0][2][0] & 0x70 for c in bus.write_i2c_block_data.call_args_list]
+        assert mux_bits == [0x70, 0x50]
+
+    def test_read_all_invalid_channel_reads_nothing(self, adc, bus):
+        with pytest.raises(ValueError, match="Invalid channel"):
+            adc.read_all([0, 4])
+        bus.write_i2c_block_data.assert_not_called()
+
+    def test_start_continuous(self, adc, bus):
+        adc.start_continuous(2)
+        calls = bus.write_i2c_block_data.call_args_list
+        # Threshold registers set for conversion-ready signalling on ALERT/RDY
+        assert calls[0] == call(0x48, 0x03, [0x80, 0x00])
+        assert calls[1] == call(0x48, 0x02, [0x00, 0x00])
+        # Config: OS=0, MUX=110, PGA=001, MODE=0, DR=100, COMP_QUE=00
+        assert calls[2] == call(0x48, 0x01, [0x62, 0x80])
+
+    def test_start_continuous_invalid_channel_raises(self, adc):
+        with pytest.raises(ValueError, match="Invalid channel"):
+            adc.start_continuous(4)
+
+    def test_read_continuous_reads_conversion_only(self, adc, bus):
+        program_conversion(bus, 0x1234)
+        assert adc.read_continuous() == 0x1234
+        bus.read_i2c_block_data.assert_called_once_with(0x48, 0x00, 2)
+        bus.write_i2c_block_data.assert_not_called()
+
+    def test_stop_continuous_restores_single_shot(self, adc, bus):
+        adc.stop_continuous()
+        config_msb = bus.write_i2c_block_data.call_args[0][2][0]
+        assert config_msb & 0x01  # MODE=1
+        assert not config_msb & 0x80  # No conversion started
+
     def test_raw_to_v_gain_1(self, adc):
         # Gain 1 = +/- 4.096V, full scale = 32767
         v = adc.raw_to_v(32767)
@@ -93,9 +171,90 @@ class TestADS1115:
         v = adc.raw_to_v(-32768)
         assert v < 0
 
+    def test_read_sleeps_for_conversion_time_before_polling(self, adc, bus):
+        program_conversion(bus, 0x4000)
+        with patch("halspa.adc.time.sleep") as sleep:
+            adc.read(0)
+        # 128 SPS default: a single sleep of ~7.8 ms, no extra polling sleeps
+        sleep.assert_called_once()
+        assert 0.007 < sleep.call_args[0][0] < 1 / 128
+
+    def test_slow_conversion_at_8sps_does_not_time_out(self, bus):
+        adc = ADS1115(bus, address=0x48, gain=1, data_rate=8)
+        program_conversion(bus, 0x0100)
+        # 10% slower than the nominal 125 ms
+        with simulated_clock(bus, ready_at=0.1375):
+            assert adc.read(0) == 0x0100
+
+    def test_conversion_timeout_scales_with_data_rate(self, bus):
+        adc = ADS1115(bus, address=0x48, gain=1, data_rate=8)
+        with simulated_clock(bus, ready_at=None) as clock:
+            with pytest.raises(TimeoutError):
+                adc.read(0)
+        assert clock[0] > 0.15
+
+    def test_read_when_ready_costs_one_poll_and_one_read(self, adc, bus):
+        program_conversion(bus, 0x4000)
+        with patch("halspa.adc.time.sleep"):
+            adc.read(0)
+        assert bus.read_byte.call_count == 1
+        assert bus.read_i2c_block_data.call_count == 1
+
+    def test_read_burst(self, adc, bus):
+        program_conversion(bus, 0x0001, 0x0002, 0x0003)
+        with patch("halspa.adc.time.sleep") as sleep:
+            samples = adc.read_burst(2, 3)
+        assert samples == [1, 2, 3]
+        assert sleep.call_count == 3
+        # Thresholds + continuous config, then back to single-shot
+        config_writes = [
+            c[0][2] for c in bus.write_i2c_block_data.call_args_list if c[0][1] == 0x01
+        ]
+        assert len(config_writes) == 2
+        assert not config_writes[0][0] & 0x01  # Continuous
+        assert config_writes[1][0] & 0x01  # Single-shot
+
+    def test_read_burst_stops_on_error(self, adc, bus):
+        bus.read_i2c_block_data.side_effect = OSError("I2C error")
+        with patch("halspa.adc.time.sleep"):
+            with pytest.raises(OSError):
+                adc.read_burst(0, 4)
+        assert bus.write_i2c_block_data.call_args[0][2][0] & 0x01
+
+    def test_raws_to_v(self, adc):
+        assert adc.raws_to_v([0, 16384, -32768]) == [
+            adc.raw_to_v(0),
+            adc.raw_to_v(16384),
+            adc.raw_to_v(-32768),
+        ]
+
+    def test_start_conversion_does_not_wait(self, adc, bus):
+        with patch("halspa.adc.time.sleep") as sleep:
+            adc.start_conversion(1)
+        sleep.assert_not_called()
+        bus.read_byte.assert_not_called()
+        config_msb = bus.write_i2c_block_data.call_args[0][2][0]
+        assert config_msb & 0x70 == 0x50
+
+    def test_fetch_result(self, adc, bus):
+        adc.start_conversion(1)
+        program_conversion(bus, 0x0102)
+        assert adc.fetch_result() == 0x0102
+
+    def test_fetch_result_skips_sleep_when_already_due(self, adc, bus):
+        adc.start_conversion(1)
+        adc._conversion_due = 0.0
+        with patch("halspa.adc.time.sleep") as sleep:
+            adc.fetch_result()
+        sleep.assert_not_called()
+
+    def test_start_conversion_invalid_channel_raises(self, adc):
+        with pytest.raises(ValueError, match="Invalid channel"):
+            adc.start_conversion(4)
+
     def test_conversion_timeout(self, adc, bus):
         # Always return OS=0 (busy)
-        bus.read_i2c_block_data.return_value = [0x00, 0x00]
+        bus.read_byte.return_value = 0x00
         with pytest.raises(TimeoutError, match="timed out"):
             adc.read(0)
 
@@ -103,53 +262,58 @@ class TestADS1115:
 class TestADCChannel:
     def test_read_v_no_scaling(self, adc, bus):
         ch = ADCChannel(adc, 0)
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x40, 0x00],  # 16384
-        ]
+        program_conversion(bus, 0x4000)  # 16384
         v = ch.read_v()
         expected = 16384 * 4.096 / 32767
         assert abs(v - expected) < 0.001
 
+    def test_scale_change_applies_to_read_v(self, adc, bus):
+        ch = ADCChannel(adc, 0)
+        ch.scale = 2.0
+        program_conversion(bus, 0x4000)
+        assert abs(ch.read_v() - 2.0 * 16384 * 4.096 / 32767) < 0.001
+
     def test_read_v_with_voltage_divider(self, adc, bus):
         # rt=10000 with rb=10000 gives scale=2.0
         ch = ADCChannel(adc, 0, rt=10000)
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x40, 0x00],
-        ]
+        program_conversion(bus, 0x4000)
         v = ch.read_v()
         expected = 2.0 * 16384 * 4.096 / 32767
         assert abs(v - expected) < 0.001
 
     def test_read_v_with_explicit_scale(self, adc, bus):
         ch = ADCChannel(adc, 0, scale=3.0)
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x40, 0x00],
-        ]
+        program_conversion(bus, 0x4000)
         v = ch.read_v()
         expected = 3.0 * 16384 * 4.096 / 32767
         assert abs(v - expected) < 0.001
 
+    def test_read_raw_v_uses_one_conversion(self, adc, bus):
+        ch = ADCChannel(adc, 0, scale=2.0)
+        program_conversion(bus, 0x4000)
+        raw, v = ch.read_raw_v()
+        assert raw == 0x4000
+        assert abs(v - 2.0 * 16384 * 4.096 / 32767) < 0.001
+        bus.write_i2c_block_data.assert_called_once()
+
 
 class TestADCDiff:
     def test_read_v(self, adc, bus):
         diff = ADCDiff(adc, 0, 1)
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x10, 0x00],
-        ]
+        program_conversion(bus, 0x1000)
         v = diff.read_v()
         expected = 0x1000 * 4.096 / 32767
         assert abs(v - expected) < 0.001
 
+    def test_scale_change_applies_to_read_v(self, adc, bus):
+        diff = ADCDiff(adc, 0, 1)
+        diff.scale = 4.0
+        program_conversion(bus, 0x1000)
+        assert abs(diff.read_v() - 4.0 * 0x1000 * 4.096 / 32767) < 0.001
+
     def test_read_v_with_scale(self, adc, bus):
         diff = ADCDiff(adc, 0, 1, scale=4.0)
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x10, 0x00],
-        ]
+        program_conversion(bus, 0x1000)
         v = diff.read_v()
         expected = 4.0 * 0x1000 * 4.096 / 32767
         assert abs(v - expected) < 0.001
@@ -161,10 +325,7 @@ class TestAnalogMuxADCChannel:
         ch = ADCChannel(adc, 0)
         mux_ch = AnalogMuxADCChannel(mux, 2, 4, ch)
 
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x40, 0x00],
-        ]
+        program_conversion(bus, 0x4000)
         mux_ch.read_v()
         mux.select.assert_called_once_with(2, 4)
 
@@ -173,10 +334,18 @@ class TestAnalogMuxADCChannel:
         ch = ADCChannel(adc, 0)
         mux_ch = AnalogMuxADCChannel(mux, 3, 1, ch)
 
-        bus.read_i2c_block_data.side_effect = [
-            [0x80, 0x00],
-            [0x20, 0x00],
-        ]
+        program_conversion(bus, 0x2000)
         raw = mux_ch.read_raw()
         mux.select.assert_called_once_with(3, 1)
         assert raw == 0x2000
+
+    def test_read_raw_v_selects_mux_first(self, adc, bus):
+        mux = MagicMock()
+        ch = ADCChannel(adc, 0)
+        mux_ch = AnalogMuxADCChannel(mux, 1, 7, ch)
+
+        program_conversion(bus, 0x1000)
+        raw, v = mux_ch.read_raw_v()
+        mux.select.assert_called_once_with(1, 7)
+        assert raw == 0x1000
+        assert v == adc.raw_to_v(0x1000)
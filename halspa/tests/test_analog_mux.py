@@ -1,23 +1,17 @@
 """Tests for AnalogMux with mocked SMBus."""
 
-from unittest.mock import MagicMock
-
 import pytest
 
 from halspa.analog_mux import (
     ADDR_PINS,
     ADDR_REVERSED,
+    ANAMUX_CTRL_ADDR,
     ANAMUX_INITIAL_STATE,
     INH_PINS,
     AnalogMux,
+    _REV3,
 )
-
-
-@pytest.fixture
-def bus():
-    mock = MagicMock()
-    mock.read_byte_data.return_value = 0
-    return mock
+from halspa.tca9535 import OUTPUT_PORT_1
 
 
 @pytest.fixture
@@ -34,22 +28,20 @@ class TestAnalogMuxInit:
 
 
 class TestAnalogMuxEnable:
-    def test_enable_mux_1(self, mux):
-        inh_pin = INH_PINS[0]
-        mux.enable(1, True)
+    @pytest.mark.parametrize("mux_num", [1, 2, 3, 4])
+    def test_enable_mux(self, mux, mux_num):
+        inh_pin = INH_PINS[mux_num - 1]
+        mux.enable(mux_num, True)
         # INH is active-low: enable=True means INH bit=0
         assert not (mux.ctrl.output & (1 << inh_pin))
 
-    def test_disable_mux_1(self, mux):
-        inh_pin = INH_PINS[0]
-        mux.enable(1, False)
+    @pytest.mark.parametrize("mux_num", [1, 2, 3, 4])
+    def test_disable_mux(self, mux, mux_num):
+        inh_pin = INH_PINS[mux_num - 1]
+        mux.enable(mux_num, True)
+        mux.enable(mux_num, False)
         assert mux.ctrl.output & (1 << inh_pin)
 
-    def test_enable_mux_4(self, mux):
-        inh_pin = INH_PINS[3]
-        mux.enable(4, True)
-        assert not (mux.ctrl.output & (1 << inh_pin))
-
     def test_invalid_mux_number_raises(self, mux):
         with pytest.raises(ValueError):
             mux.enable(0)
@@ -58,38 +50,20 @@ class TestAnalogMuxEnable:
 
 
 class TestAnalogMuxSet:
-    def test_set_mux_3_pin_5(self, mux):
-        """Mux 3 is not reversed, so address bits should match pin number."""
-        addr_pin = ADDR_PINS[2]  # mux 3
-        assert not ADDR_REVERSED[2]  # mux 3 not reversed
-
-        mux.set(3, 5)
-        addr_bits = (mux.ctrl.output >> addr_pin) & 0b111
-        assert addr_bits == 5
-
-    def test_set_mux_1_pin_5_reversed(self, mux):
-        """Mux 1 is reversed, so 5 (0b101) should become 0b101 reversed = 0b101."""
-        addr_pin = ADDR_PINS[0]
-        assert ADDR_REVERSED[0]
-
-        mux.set(1, 5)
-        addr_bits = (mux.ctrl.output >> addr_pin) & 0b111
-        # 5 = 0b101, reversed 3-bit = 0b101 = 5
-        assert addr_bits == 5
-
-    def test_set_mux_1_pin_3_reversed(self, mux):
-        """Mux 1 is reversed, so 3 (0b011) should become 0b110 = 6."""
-        addr_pin = ADDR_PINS[0]
-        mux.set(1, 3)
-        addr_bits = (mux.ctrl.output >> addr_pin) & 0b111
-        assert addr_bits == 6
-
-    def test_set_mux_4_pin_0(self, mux):
-        """Mux 4 is not reversed."""
-        addr_pin = ADDR_PINS[3]
-        mux.set(4, 0)
-        addr_bits = (mux.ctrl.output >> addr_pin) & 0b111
-        assert addr_bits == 0
+    @pytest.mark.parametrize(
+        "mux_num,pin,reversed_,expected",
+        [
+            (3, 5, False, 5),
+            (4, 0, False, 0),
+            (1, 5, True, 5),  # 0b101 reversed is 0b101
+            (1, 3, True, 6),  # 0b011 reversed is 0b110
+        ],
+    )
+    def test_set_address_bits(self, mux, mux_num, pin, reversed_, expected):
+        assert ADDR_REVERSED[mux_num - 1] is reversed_
+        mux.set(mux_num, pin)
+        addr_bits = (mux.ctrl.output >> ADDR_PINS[mux_num - 1]) & 0b111
+        assert addr_bits == expected
 
     def test_invalid_pin_raises(self, mux):
         with pytest.raises(ValueError):
@@ -113,16 +87,108 @@ class TestAnalogMuxSelect:
         addr_bits = (mux.ctrl.output >> addr_pin) & 0b111
         assert addr_bits == 5
 
+    def test_select_inhibited_mux_addresses_before_enable(self, mux, bus):
+        inh_pin = INH_PINS[0]
+        assert mux.ctrl.output & (1 << inh_pin)
 
-class TestReverseBits:
-    def test_reverse_0(self):
-        assert AnalogMux._reverse_bits(0b000, 3) == 0b000
+        written = []
+        mux.ctrl.write = lambda value: written.append(value)
+        mux.select(1, 2)
+
+        assert len(written) == 2
+        # First write: still inhibited, new address set
+        assert written[0] & (1 << inh_pin)
+        assert (written[0] >> ADDR_PINS[0]) & 0b111 == _REV3[2]
+        # Second write: only INH released
+        assert written[1] == written[0] & ~(1 << inh_pin)
+
+    def test_select_inhibited_mux_on_current_address_writes_once(self, mux, bus):
+        # Mux 1 starts inhibited on address 0
+        bus.write_i2c_block_data.reset_mock()
+        mux.select(1, 0)
+        assert bus.write_i2c_block_data.call_count == 1
+        assert not (mux.ctrl.output & (1 << INH_PINS[0]))
+
+    def test_select_enabled_mux_inhibits_before_readdressing(self, mux, bus):
+        inh_pin = INH_PINS[0]
+        mux.select(1, 2)
+
+        written = []
+        mux.ctrl.write = lambda value: written.append(value)
+        mux.select(1, 6)
+
+        assert len(written) == 2
+        # First write: inhibited and already on the new address
+        assert written[0] & (1 << inh_pin)
+        assert (written[0] >> ADDR_PINS[0]) & 0b111 == _REV3[6]
+        # Second write: only INH released
+        assert written[1] == written[0] & ~(1 << inh_pin)
+
+    def test_select_in_batch_sends_inhibit_step_first(self, mux, bus):
+        # Mux 1 lives on port 1 (INH = bit 7, address = bits 4-6)
+        bus.write_byte_data.reset_mock()
+        with mux.ctrl.batch():
+            mux.select(1, 2)
+            # Inhibited on the new address; the enable waits for the commit
+            bus.write_byte_data.assert_called_once_with(
+                ANAMUX_CTRL_ADDR, OUTPUT_PORT_1, 0x80 | (_REV3[2] << 4) | 0x08
+            )
+        assert bus.write_byte_data.call_count == 2
+        assert bus.write_byte_data.call_args[0][2] == (_REV3[2] << 4) | 0x08
+
+    def test_select_in_batch_with_other_port_dirty(self, mux, bus):
+        # Mux 3 lives on port 0, mux 1 on port 1
+        inh_pin = INH_PINS[0]
+        bus.write_i2c_block_data.reset_mock()
+        with mux.ctrl.batch():
+            mux.select(3, 2)
+            bus.write_i2c_block_data.reset_mock()
+            mux.select(1, 5)
+            # Both ports are dirty: the inhibit step goes out as one pair write
+            bus.write_i2c_block_data.assert_called_once()
+            lo, hi = bus.write_i2c_block_data.call_args[0][2]
+            written = lo | (hi << 8)
+            assert written & (1 << inh_pin)
+            assert (written >> ADDR_PINS[0]) & 0b111 == _REV3[5]
+        assert not (mux.ctrl.output & (1 << inh_pin))
 
-    def test_reverse_1(self):
-        assert AnalogMux._reverse_bits(0b001, 3) == 0b100
+    def test_select_same_pin_again_writes_nothing(self, mux, bus):
+        mux.select(2, 4)
+        bus.write_i2c_block_data.reset_mock()
+        mux.select(2, 4)
+        bus.write_i2c_block_data.assert_not_called()
+
+    def test_select_after_disable_writes(self, mux, bus):
+        mux.select(2, 4)
+        mux.enable(2, False)
+        bus.write_i2c_block_data.reset_mock()
+        mux.select(2, 4)
+        assert bus.write_i2c_block_data.call_count == 1
+        assert not (mux.ctrl.output & (1 << INH_PINS[1]))
+
+    def test_select_invalid_args_raise(self, mux):
+        with pytest.raises(ValueError):
+            mux.select(0, 0)
+        with pytest.raises(ValueError):
+            mux.select(1, 8)
 
-    def test_reverse_symmetric(self):
-        assert AnalogMux._reverse_bits(0b101, 3) == 0b101
 
-    def test_reverse_asymmetric(self):
-        assert AnalogMux._reverse_bits(0b011, 3) == 0b110
+class TestReverseBits:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (0b000, 0b000),
+            (0b001, 0b100),
+            (0b010, 0b010),
+            (0b011, 0b110),
+            (0b100, 0b001),
+            (0b101, 0b101),
+            (0b110, 0b011),
+            (0b111, 0b111),
+        ],
+    )
+    def test_reverse(self, value, expected):
+        assert _REV3[value] == expected
+
+    def test_table_is_involution(self):
+        assert all(_REV3[_REV3[v]] == v for v in range(8))
@@ -3,15 +3,18 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from smbus2 import I2cFunc
 
-from halspa.board import HalspaBoard
+from halspa.board import BOARD_ADDRESSES, HalspaBoard
+from halspa.tca9535 import CONFIGURATION_PORT_0, OUTPUT_PORT_0
 
 
 @pytest.fixture
 def mock_smbus():
     with patch("halspa.board.SMBus") as MockSMBus:
         mock_bus = MagicMock()
-        mock_bus.read_byte_data.return_value = 0
+        mock_bus.read_i2c_block_data.return_value = [0, 0]
+        mock_bus.funcs = I2cFunc.SMBUS_QUICK | I2cFunc.SMBUS_READ_BYTE
         MockSMBus.return_value = mock_bus
         yield MockSMBus, mock_bus
 
@@ -44,16 +47,55 @@ class TestHalspaBoardInit:
         assert board.adc1.address == 0x48
         assert board.adc2.address == 0x49
 
+    def test_power_initialized_eagerly(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        # All DUT rails are switched off by the constructor
+        mock_bus.write_i2c_block_data.assert_any_call(0x20, OUTPUT_PORT_0, [0, 0])
+        assert board.power.tca9535.output == 0
+
+    @pytest.mark.parametrize("address", [0x22, 0x23])
+    def test_digexps_reset_to_inputs_eagerly(self, mock_smbus, address):
+        _, mock_bus = mock_smbus
+        HalspaBoard()
+        mock_bus.write_i2c_block_data.assert_any_call(
+            address, CONFIGURATION_PORT_0, [0xFF, 0xFF]
+        )
+
+    def test_other_devices_initialized_lazily(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        mock_bus.write_i2c_block_data.reset_mock()
+        adc = board.adc1
+        assert board.adc1 is adc
+        mock_bus.write_i2c_block_data.assert_not_called()
+        board.mux
+        mock_bus.write_i2c_block_data.assert_called()
+
 
 class TestHalspaBoardInitFailure:
-    def test_closes_bus_on_device_init_failure(self, mock_smbus):
+    def test_closes_bus_on_power_init_failure(self, mock_smbus):
         _, mock_bus = mock_smbus
         # Make the first I2C write fail (PowerControl init)
-        mock_bus.write_byte_data.side_effect = OSError("I2C device not responding")
+        mock_bus.write_i2c_block_data.side_effect = OSError(
+            "I2C device not responding"
+        )
         with pytest.raises(OSError):
             HalspaBoard()
         mock_bus.close.assert_called_once()
 
+    def test_lazy_device_init_failure_raises_on_access(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        mock_bus.write_i2c_block_data.side_effect = OSError(
+            "I2C device not responding"
+        )
+        with pytest.raises(OSError):
+            board.mux
+        # The bus stays open for the other devices
+        mock_bus.close.assert_not_called()
+        assert board.adc1.address == 0x48
+
 
 class TestHalspaBoardContextManager:
     def test_context_manager_closes_bus(self, mock_smbus):
@@ -70,20 +112,69 @@ class TestHalspaBoardContextManager:
 class TestHalspaBoardScan:
     def test_i2c_scan_finds_devices(self, mock_smbus):
         _, mock_bus = mock_smbus
+        present = [0x20, 0x21, 0x22, 0x23, 0x48, 0x49, 0x50]
+
+        def write_quick_side_effect(addr):
+            if addr not in present:
+                raise OSError("No device")
 
         def read_byte_side_effect(addr):
-            if addr in [0x20, 0x21, 0x22, 0x23, 0x48, 0x49]:
+            if addr in present:
                 return 0
             raise OSError("No device")
 
+        mock_bus.write_quick.side_effect = write_quick_side_effect
         mock_bus.read_byte.side_effect = read_byte_side_effect
 
         board = HalspaBoard()
         found = board.i2c_scan()
-        assert found == [0x20, 0x21, 0x22, 0x23, 0x48, 0x49]
+        assert found == present
+
+    def test_i2c_scan_uses_quick_write(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        board.i2c_scan()
+        # EEPROM-prone ranges are probed with a byte read instead
+        probed = {c[0][0] for c in mock_bus.write_quick.call_args_list}
+        assert not probed & {0x30, 0x37, 0x50, 0x5F}
+        assert mock_bus.write_quick.call_count == 0x75 - 24
+        assert mock_bus.read_byte.call_count == 24
+
+    def test_i2c_scan_without_quick_support_reads(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        mock_bus.funcs = I2cFunc.SMBUS_READ_BYTE
+        board = HalspaBoard()
+        found = board.i2c_scan(only=BOARD_ADDRESSES)
+        assert found == list(BOARD_ADDRESSES)
+        mock_bus.write_quick.assert_not_called()
+        assert mock_bus.read_byte.call_count == len(BOARD_ADDRESSES)
+
+    def test_i2c_scan_only_probes_given_addresses(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        found = board.i2c_scan(only=[0x49, 0x20, 0x48, 0x20])
+        assert found == [0x20, 0x48, 0x49]
+        assert mock_bus.write_quick.call_count == 3
+        mock_bus.read_byte.assert_not_called()
+
+    def test_i2c_scan_board_addresses(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        found = board.i2c_scan(only=BOARD_ADDRESSES)
+        assert found == list(BOARD_ADDRESSES)
+        assert mock_bus.write_quick.call_count == len(BOARD_ADDRESSES)
+
+    def test_i2c_scan_skip(self, mock_smbus):
+        _, mock_bus = mock_smbus
+        board = HalspaBoard()
+        board.i2c_scan(skip=range(0x50, 0x60))
+        probed = {c[0][0] for c in mock_bus.write_quick.call_args_list}
+        probed |= {c[0][0] for c in mock_bus.read_byte.call_args_list}
+        assert probed == set(range(0x03, 0x78)) - set(range(0x50, 0x60))
 
     def test_i2c_scan_empty_bus(self, mock_smbus):
         _, mock_bus = mock_smbus
+        mock_bus.write_quick.side_effect = OSError("No device")
         mock_bus.read_byte.side_effect = OSError("No device")
 
         board = HalspaBoard()
@@ -1,7 +1,5 @@
 """Tests for PowerControl with mocked SMBus."""
 
-from unittest.mock import MagicMock
-
 import pytest
 
 from halspa.power import (
@@ -11,19 +9,16 @@ from halspa.power import (
     EN_5VD_PIN,
     EN_LIM_1_PIN,
     EN_LIM_2_PIN,
+    EN_LIM_3_PIN,
+    EN_LIM_4_PIN,
     FAULT_12V_1_PIN,
     FAULT_LIM_1_PIN,
     PG_3V3_PIN,
     PG_5VD_PIN,
     PowerControl,
+    decode_fault,
 )
-
-
-@pytest.fixture
-def bus():
-    mock = MagicMock()
-    mock.read_byte_data.return_value = 0
-    return mock
+from halspa.tca9535 import OUTPUT_PORT_1
 
 
 @pytest.fixture
@@ -44,34 +39,69 @@ class TestPowerControlInit:
 
 
 class TestPowerControlEnable:
-    def test_enable_5v(self, power):
-        power.enable_5v(True)
-        assert power.tca9535.output & (1 << EN_5VD_PIN)
+    @pytest.mark.parametrize(
+        "method,pin",
+        [
+            ("enable_5v", EN_5VD_PIN),
+            ("enable_3v3", EN_3V3D_PIN),
+            ("enable_12v_1", EN_12V_1_PIN),
+            ("enable_12v_2", EN_12V_2_PIN),
+            ("enable_current_limit_1", EN_LIM_1_PIN),
+            ("enable_current_limit_2", EN_LIM_2_PIN),
+            ("enable_current_limit_3", EN_LIM_3_PIN),
+            ("enable_current_limit_4", EN_LIM_4_PIN),
+        ],
+    )
+    def test_enable_disable(self, power, method, pin):
+        getattr(power, method)(True)
+        assert power.tca9535.output & (1 << pin)
+        getattr(power, method)(False)
+        assert not (power.tca9535.output & (1 << pin))
 
-    def test_disable_5v(self, power):
+    def test_disable_retried_after_bus_error(self, power, bus):
         power.enable_5v(True)
+        bus.write_byte_data.side_effect = OSError
+        with pytest.raises(OSError):
+            power.enable_5v(False)
+        bus.write_byte_data.side_effect = None
+        bus.write_byte_data.reset_mock()
         power.enable_5v(False)
-        assert not (power.tca9535.output & (1 << EN_5VD_PIN))
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_1, 0x00)
+
+    def test_enable_many_single_write(self, power, bus):
+        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
+        power.enable_many(
+            {"5v": True, "3v3": True, "12v_1": True, "current_limit_1": True}
+        )
+        expected = (
+            (1 << EN_5VD_PIN)
+            | (1 << EN_3V3D_PIN)
+            | (1 << EN_12V_1_PIN)
+            | (1 << EN_LIM_1_PIN)
+        )
+        assert power.tca9535.output == expected
+        # Rails span both ports: one block write
+        bus.write_i2c_block_data.assert_called_once()
+        bus.write_byte_data.assert_not_called()
 
-    def test_enable_3v3(self, power):
+    def test_enable_many_disables(self, power):
+        power.enable_5v(True)
         power.enable_3v3(True)
+        power.enable_many({"5v": False})
+        assert not (power.tca9535.output & (1 << EN_5VD_PIN))
         assert power.tca9535.output & (1 << EN_3V3D_PIN)
 
-    def test_enable_12v_1(self, power):
-        power.enable_12v_1(True)
-        assert power.tca9535.output & (1 << EN_12V_1_PIN)
-
-    def test_enable_12v_2(self, power):
-        power.enable_12v_2(True)
-        assert power.tca9535.output & (1 << EN_12V_2_PIN)
-
-    def test_enable_current_limit_1(self, power):
-        power.enable_current_limit_1(True)
-        assert power.tca9535.output & (1 << EN_LIM_1_PIN)
+    def test_enable_many_defer(self, power, bus):
+        bus.write_byte_data.reset_mock()
+        power.enable_many({"12v_1": True, "12v_2": True}, defer=True)
+        bus.write_byte_data.assert_not_called()
+        power.commit()
+        bus.write_byte_data.assert_called_once()
 
-    def test_enable_current_limit_2(self, power):
-        power.enable_current_limit_2(True)
-        assert power.tca9535.output & (1 << EN_LIM_2_PIN)
+    def test_enable_many_unknown_output_raises(self, power):
+        with pytest.raises(ValueError, match="Unknown power output"):
+            power.enable_many({"24v": True})
 
 
 class TestPowerControlContextManager:
@@ -91,20 +121,95 @@ class TestPowerControlContextManager:
 class TestPowerControlDefer:
     def test_deferred_enable_does_not_write_immediately(self, power, bus):
         bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
         power.enable_5v(True, defer=True)
         power.enable_3v3(True, defer=True)
         # Shadow register updated but only init writes happened
         assert power.tca9535.output & (1 << EN_5VD_PIN)
         assert power.tca9535.output & (1 << EN_3V3D_PIN)
-        # No write_byte_data calls for the deferred bits
+        # No bus writes for the deferred bits
         bus.write_byte_data.assert_not_called()
+        bus.write_i2c_block_data.assert_not_called()
 
     def test_commit_writes_deferred(self, power, bus):
         power.enable_5v(True, defer=True)
         power.enable_3v3(True, defer=True)
         bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
         power.commit()
-        assert bus.write_byte_data.call_count == 2  # Port 0 and port 1
+        # Both rails are on port 1, so only that port is written
+        bus.write_byte_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_1, power.tca9535.output >> 8
+        )
+        bus.write_i2c_block_data.assert_not_called()
+
+
+class TestPowerControlBatch:
+    def test_batch_writes_once_on_exit(self, power, bus):
+        bus.write_i2c_block_data.reset_mock()
+        with power.batch():
+            power.enable_5v(True)
+            power.enable_12v_1(True)
+            power.enable_current_limit_1(True)
+            bus.write_byte_data.assert_not_called()
+            bus.write_i2c_block_data.assert_not_called()
+        assert power.tca9535.output & (1 << EN_5VD_PIN)
+        assert power.tca9535.output & (1 << EN_12V_1_PIN)
+        assert power.tca9535.output & (1 << EN_LIM_1_PIN)
+        assert bus.write_i2c_block_data.call_count == 1  # One commit
+        bus.write_byte_data.assert_not_called()
+
+    def test_batch_defers_context_manager_disable(self, power, bus):
+        with power.batch():
+            with power.enable_12v_2():
+                pass
+            bus.write_byte_data.reset_mock()
+        assert not (power.tca9535.output & (1 << EN_12V_2_PIN))
+        assert bus.write_byte_data.call_count == 1
+
+    def test_batch_defers_disable_all(self, power, bus):
+        power.enable_5v(True)
+        bus.write_i2c_block_data.reset_mock()
+        with power.batch():
+            power.disable_all()
+            bus.write_i2c_block_data.assert_not_called()
+        assert power.tca9535.output == 0
+        bus.write_i2c_block_data.assert_called_once()
+
+    def test_commit_inside_batch_writes_both_ports(self, power, bus):
+        bus.write_i2c_block_data.reset_mock()
+        with power.batch():
+            power.enable_5v(True)
+            power.enable_current_limit_1(True)
+            power.commit()
+            bus.write_i2c_block_data.assert_called_once()
+        assert bus.write_i2c_block_data.call_count == 1
+
+    def test_nested_batch_commits_at_outer_exit(self, power, bus):
+        bus.write_byte_data.reset_mock()
+        with power.batch():
+            with power.batch():
+                power.enable_5v(True)
+            bus.write_byte_data.assert_not_called()
+        assert bus.write_byte_data.call_count == 1
+
+    def test_batch_commits_on_exception(self, power, bus):
+        bus.write_byte_data.reset_mock()
+        with pytest.raises(RuntimeError):
+            with power.batch():
+                power.enable_5v(True)
+                raise RuntimeError("test")
+        assert bus.write_byte_data.call_count == 1
+        power.enable_3v3(True)
+        assert bus.write_byte_data.call_count == 2  # No longer batching
+
+    def test_empty_batch_writes_nothing(self, power, bus):
+        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
+        with power.batch():
+            pass
+        bus.write_byte_data.assert_not_called()
+        bus.write_i2c_block_data.assert_not_called()
 
 
 class TestPowerControlStatus:
@@ -115,9 +220,14 @@ class TestPowerControlStatus:
         power.disable_all()
         assert power.tca9535.output == 0
 
+    def test_disable_all_always_writes(self, power, bus):
+        bus.write_i2c_block_data.reset_mock()
+        power.disable_all()
+        bus.write_i2c_block_data.assert_called_once()
+
     def test_read_fault(self, power, bus):
         # Simulate fault on LIM1 (pin 6) and 12V_1 (pin 14)
-        bus.read_byte_data.side_effect = [
+        bus.read_i2c_block_data.return_value = [
             (1 << FAULT_LIM_1_PIN) & 0xFF,  # Port 0
             ((1 << FAULT_12V_1_PIN) >> 8) & 0xFF,  # Port 1
         ]
@@ -126,10 +236,43 @@ class TestPowerControlStatus:
         assert fault & (1 << FAULT_12V_1_PIN)
 
     def test_read_power_good(self, power, bus):
-        bus.read_byte_data.side_effect = [
+        bus.read_i2c_block_data.return_value = [
             0x00,  # Port 0
             ((1 << PG_3V3_PIN) | (1 << PG_5VD_PIN)) >> 8,  # Port 1
         ]
         pg = power.read_power_good()
         assert pg & (1 << PG_3V3_PIN)
         assert pg & (1 << PG_5VD_PIN)
+
+    def test_status_not_cached_by_default(self, power, bus):
+        power.read_fault()
+        power.read_power_good()
+        assert bus.read_i2c_block_data.call_count == 2  # Two full reads
+
+    def test_status_cached_within_ttl(self, bus):
+        power = PowerControl(bus, cache_ttl=60.0)
+        bus.read_i2c_block_data.return_value = [
+            (1 << FAULT_LIM_1_PIN) & 0xFF,
+            ((1 << PG_5VD_PIN) >> 8) & 0xFF,
+        ]
+        assert power.read_fault() & (1 << FAULT_LIM_1_PIN)
+        assert power.read_power_good() & (1 << PG_5VD_PIN)
+        assert bus.read_i2c_block_data.call_count == 1  # One full read
+
+    def test_write_invalidates_status_cache(self, bus):
+        power = PowerControl(bus, cache_ttl=60.0)
+        power.read_fault()
+        power.enable_5v(True)
+        power.read_fault()
+        assert bus.read_i2c_block_data.call_count == 2
+
+    def test_decode_fault(self):
+        word = (1 << FAULT_LIM_1_PIN) | (1 << FAULT_12V_1_PIN)
+        assert decode_fault(word) == {
+            "current_limit_1": True,
+            "current_limit_2": False,
+            "current_limit_3": False,
+            "current_limit_4": False,
+            "12v_1": True,
+            "12v_2": False,
+        }
@@ -1,30 +1,20 @@
 """Tests for TCA9535 driver with mocked SMBus."""
 
-from unittest.mock import MagicMock, call
+from unittest.mock import call
 
 import pytest
 
 from halspa.tca9535 import (
     CONFIGURATION_PORT_0,
-    CONFIGURATION_PORT_1,
     INPUT_PORT_0,
-    INPUT_PORT_1,
     OUTPUT_PORT_0,
     OUTPUT_PORT_1,
     POLARITY_INVERSION_PORT_0,
-    POLARITY_INVERSION_PORT_1,
     TCA9535,
     TCA9535Pin,
 )
 
 
-@pytest.fixture
-def bus():
-    mock = MagicMock()
-    mock.read_byte_data.return_value = 0
-    return mock
-
-
 @pytest.fixture
 def tca(bus):
     return TCA9535(bus, address=0x20, configuration=0xFFFF, output=0x0000)
@@ -34,45 +24,40 @@ class TestTCA9535Init:
     def test_init_writes_output_then_polarity_then_config(self, bus):
         TCA9535(bus, address=0x20, configuration=0x1234, output=0x5678, polarity_inversion=0xABCD)
 
-        calls = bus.write_byte_data.call_args_list
-        # Output port 0, output port 1
-        assert calls[0] == call(0x20, OUTPUT_PORT_0, 0x78)
-        assert calls[1] == call(0x20, OUTPUT_PORT_1, 0x56)
-        # Polarity inversion port 0, port 1
-        assert calls[2] == call(0x20, POLARITY_INVERSION_PORT_0, 0xCD)
-        assert calls[3] == call(0x20, POLARITY_INVERSION_PORT_1, 0xAB)
-        # Configuration port 0, port 1
-        assert calls[4] == call(0x20, CONFIGURATION_PORT_0, 0x34)
-        assert calls[5] == call(0x20, CONFIGURATION_PORT_1, 0x12)
+        # One transaction per register pair: output, polarity, configuration
+        assert bus.write_i2c_block_data.call_args_list == [
+            call(0x20, OUTPUT_PORT_0, [0x78, 0x56]),
+            call(0x20, POLARITY_INVERSION_PORT_0, [0xCD, 0xAB]),
+            call(0x20, CONFIGURATION_PORT_0, [0x34, 0x12]),
+        ]
+        bus.write_byte_data.assert_not_called()
 
 
 class TestTCA9535ReadWrite:
     def test_read_combines_both_ports(self, tca, bus):
-        bus.read_byte_data.side_effect = [0xAB, 0xCD]
+        bus.read_i2c_block_data.return_value = [0xAB, 0xCD]
         result = tca.read()
         assert result == 0xCDAB
         assert tca.input == 0xCDAB
-        bus.read_byte_data.assert_any_call(0x20, INPUT_PORT_0)
-        bus.read_byte_data.assert_any_call(0x20, INPUT_PORT_1)
+        bus.read_i2c_block_data.assert_called_once_with(0x20, INPUT_PORT_0, 2)
 
-    def test_write_splits_to_both_ports(self, tca, bus):
-        bus.write_byte_data.reset_mock()
+    def test_write_sends_both_ports_in_one_transaction(self, tca, bus):
+        bus.write_i2c_block_data.reset_mock()
         tca.write(0x1234)
         assert tca.output == 0x1234
-        bus.write_byte_data.assert_any_call(0x20, OUTPUT_PORT_0, 0x34)
-        bus.write_byte_data.assert_any_call(0x20, OUTPUT_PORT_1, 0x12)
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x34, 0x12]
+        )
 
-    def test_write_bit_low_pin(self, tca, bus):
+    @pytest.mark.parametrize(
+        "pin,port,byte",
+        [(3, OUTPUT_PORT_0, 0x08), (10, OUTPUT_PORT_1, 0x04)],
+    )
+    def test_write_bit_writes_its_port(self, tca, bus, pin, port, byte):
         bus.write_byte_data.reset_mock()
-        tca.write_bit(3, True)
-        assert tca.output & (1 << 3)
-        bus.write_byte_data.assert_called_with(0x20, OUTPUT_PORT_0, 0x08)
-
-    def test_write_bit_high_pin(self, tca, bus):
-        bus.write_byte_data.reset_mock()
-        tca.write_bit(10, True)
-        assert tca.output & (1 << 10)
-        bus.write_byte_data.assert_called_with(0x20, OUTPUT_PORT_1, 0x04)
+        tca.write_bit(pin, True)
+        assert tca.output & (1 << pin)
+        bus.write_byte_data.assert_called_once_with(0x20, port, byte)
 
     def test_write_bit_defer_does_not_write(self, tca, bus):
         bus.write_byte_data.reset_mock()
@@ -83,18 +68,188 @@ class TestTCA9535ReadWrite:
     def test_commit_writes_deferred(self, tca, bus):
         tca.write_bit(5, True, defer=True)
         tca.write_bit(10, True, defer=True)
+        bus.write_i2c_block_data.reset_mock()
+        tca.commit()
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x20, 0x04]
+        )
+
+    def test_write_bits_single_port_one_write(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        tca.write_bits([(1, True), (3, True), (5, False)])
+        assert tca.output == 0x000A
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x0A)
+
+    def test_write_bits_both_ports(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
+        tca.write_bits([(0, True), (15, True)])
+        assert tca.output == 0x8001
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x01, 0x80]
+        )
+        bus.write_byte_data.assert_not_called()
+
+    def test_write_bits_last_update_wins(self, tca, bus):
+        tca.write_bits([(4, True), (4, False), (6, False), (6, True)])
+        assert tca.output == 1 << 6
+
+    def test_write_bits_defer_does_not_write(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        tca.write_bits([(2, True), (9, True)], defer=True)
+        assert tca.output == (1 << 2) | (1 << 9)
+        bus.write_byte_data.assert_not_called()
+
+    def test_write_bits_invalid_pin_raises(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        with pytest.raises(ValueError):
+            tca.write_bits([(3, True), (16, True)])
+        assert tca.output == 0
+        bus.write_byte_data.assert_not_called()
+
+    def test_commit_writes_only_dirty_port(self, tca, bus):
+        tca.write_bit(1, True, defer=True)
+        tca.write_bit(4, True, defer=True)
+        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
+        tca.commit()
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x12)
+        bus.write_i2c_block_data.assert_not_called()
+
+    def test_commit_without_changes_writes_nothing(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
+        tca.commit()
+        bus.write_byte_data.assert_not_called()
+        bus.write_i2c_block_data.assert_not_called()
+
+    def test_immediate_write_clears_dirty_port(self, tca, bus):
+        tca.write_bit(2, True, defer=True)
+        tca.write_bit(3, True)  # Writes port 0, including pin 2
+        bus.write_byte_data.reset_mock()
+        tca.commit()
+        bus.write_byte_data.assert_not_called()
+
+    def test_write_bits_defer_then_commit(self, tca, bus):
+        tca.write_bits([(9, True), (12, True)], defer=True)
+        bus.write_byte_data.reset_mock()
+        tca.commit()
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_1, 0x12)
+
+    def test_toggle_mask_both_ports_one_write(self, tca, bus):
+        tca.output = 0x0101
+        bus.write_i2c_block_data.reset_mock()
+        tca.toggle_mask(0x8003)
+        assert tca.output == 0x8102
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x02, 0x81]
+        )
+
+    def test_toggle_mask_defer(self, tca, bus):
         bus.write_byte_data.reset_mock()
+        tca.toggle_mask(0x0030, defer=True)
+        assert tca.output == 0x0030
+        bus.write_byte_data.assert_not_called()
         tca.commit()
-        bus.write_byte_data.assert_any_call(0x20, OUTPUT_PORT_0, 0x20)
-        bus.write_byte_data.assert_any_call(0x20, OUTPUT_PORT_1, 0x04)
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x30)
+
+    def test_toggle_mask_invalid_raises(self, tca):
+        with pytest.raises(ValueError):
+            tca.toggle_mask(0x10000)
+
+    def test_batch_commits_once(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        with tca.batch():
+            tca.write_bit(1, True)
+            tca.get_pin(2).write(True)
+            tca.toggle_mask(0x0010)
+            bus.write_byte_data.assert_not_called()
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x16)
+
+    def test_nested_batch_commits_at_outer_exit(self, tca, bus):
+        bus.write_byte_data.reset_mock()
+        with tca.batch():
+            with tca.batch():
+                tca.write_bits([(9, True)])
+            bus.write_byte_data.assert_not_called()
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_1, 0x02)
+
+    def test_batch_defers_full_write(self, tca, bus):
+        bus.write_i2c_block_data.reset_mock()
+        with tca.batch():
+            tca.write(0x0102)
+            tca.write_bit(0, True)
+            bus.write_i2c_block_data.assert_not_called()
+            assert tca.output == 0x0103
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x03, 0x01]
+        )
+
+    def test_batch_forced_write_commits_both_ports(self, tca, bus):
+        bus.write_i2c_block_data.reset_mock()
+        with tca.batch():
+            tca.write(0x0000, force=True)
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x00, 0x00]
+        )
+
+    def test_write_unchanged_value_skipped(self, tca, bus):
+        tca.write(0x1234)
+        bus.write_i2c_block_data.reset_mock()
+        tca.write(0x1234)
+        bus.write_i2c_block_data.assert_not_called()
+        tca.write(0x1234, force=True)
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, OUTPUT_PORT_0, [0x34, 0x12]
+        )
+
+    def test_write_bit_unchanged_skipped(self, tca, bus):
+        tca.write_bit(3, True)
+        bus.write_byte_data.reset_mock()
+        tca.write_bit(3, True)
+        tca.write_bit(12, False)
+        bus.write_byte_data.assert_not_called()
+
+    def test_write_bit_unchanged_flushes_dirty_port(self, tca, bus):
+        tca.write_bit(3, True)
+        tca.write_bit(4, True, defer=True)
+        bus.write_byte_data.reset_mock()
+        tca.write_bit(3, True)
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x18)
+
+    def test_deferred_unchanged_bit_not_committed(self, tca, bus):
+        tca.write_bit(6, False, defer=True)
+        bus.write_byte_data.reset_mock()
+        tca.commit()
+        bus.write_byte_data.assert_not_called()
+
+    def test_write_bit_retried_after_bus_error(self, tca, bus):
+        bus.write_byte_data.side_effect = OSError
+        with pytest.raises(OSError):
+            tca.write_bit(3, True)
+        bus.write_byte_data.side_effect = None
+        bus.write_byte_data.reset_mock()
+        tca.write_bit(3, True)
+        bus.write_byte_data.assert_called_once_with(0x20, OUTPUT_PORT_0, 0x08)
 
     def test_read_bit(self, tca, bus):
-        bus.read_byte_data.side_effect = [0x08, 0x00]
+        bus.read_i2c_block_data.return_value = [0x08, 0x00]
         assert tca.read_bit(3) is True
 
-        bus.read_byte_data.side_effect = [0x00, 0x00]
+        bus.read_i2c_block_data.return_value = [0x00, 0x00]
         assert tca.read_bit(3) is False
 
+    def test_read_bits(self, tca, bus):
+        bus.read_i2c_block_data.reset_mock()
+        bus.read_i2c_block_data.return_value = [0x0C, 0x81]
+        assert tca.read_bits(0x8108) == 0x8108
+        assert tca.read_bits(0x0003) == 0
+        assert bus.read_i2c_block_data.call_count == 2
+
+    def test_read_bits_invalid_mask_raises(self, tca):
+        with pytest.raises(ValueError):
+            tca.read_bits(0x10000)
+
     def test_write_bit_clear(self, tca, bus):
         tca.output = 0xFF
         bus.write_byte_data.reset_mock()
@@ -123,7 +278,7 @@ class TestTCA9535ReadWrite:
 class TestTCA9535Pin:
     def test_pin_read(self, tca, bus):
         pin = tca.get_pin(5)
-        bus.read_byte_data.side_effect = [0x20, 0x00]
+        bus.read_i2c_block_data.return_value = [0x20, 0x00]
         assert pin.read() is True
 
     def test_pin_write(self, tca, bus):
@@ -152,17 +307,35 @@ class TestTCA9535Pin:
         tca.output = 1 << 5  # Shadow output: pin 5 HIGH
         # Even if the input port reads LOW (e.g. external load), toggle should
         # flip the output from HIGH to LOW based on the shadow register.
-        bus.read_byte_data.side_effect = [0x00, 0x00]
+        bus.read_i2c_block_data.return_value = [0x00, 0x00]
         bus.write_byte_data.reset_mock()
         pin.toggle()
         assert not (tca.output & (1 << 5))
 
+    @pytest.mark.parametrize(
+        "pin,port,byte",
+        [(3, OUTPUT_PORT_0, 0x08), (10, OUTPUT_PORT_1, 0x04)],
+    )
+    def test_pin_toggle_single_write(self, tca, bus, pin, port, byte):
+        bus.write_byte_data.reset_mock()
+        tca.get_pin(pin).toggle()
+        bus.write_byte_data.assert_called_once_with(0x20, port, byte)
+
+    def test_pin_is_output(self, tca):
+        pin = tca.get_pin(12)
+        assert pin.is_output is False
+        pin.configure(output=True)
+        assert pin.is_output is True
+        assert tca.configuration == 0xFFFF & ~(1 << 12)
+
     def test_pin_configure_output(self, tca, bus):
         pin = tca.get_pin(5)
-        bus.write_byte_data.reset_mock()
+        bus.write_i2c_block_data.reset_mock()
         pin.configure(output=True)
         assert not (tca.configuration & (1 << 5))
-        bus.write_byte_data.assert_any_call(0x20, CONFIGURATION_PORT_0, 0xDF)
+        bus.write_i2c_block_data.assert_called_once_with(
+            0x20, CONFIGURATION_PORT_0, [0xDF, 0xFF]
+        )
 
     def test_pin_configure_input(self, tca, bus):
         tca.configuration = 0x0000  # All outputs